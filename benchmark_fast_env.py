@@ -0,0 +1,62 @@
+# Benchmark for the accelerated environment backend. Compares rollouts per second and MCTS decision time for both
+# backends. Equivalence of the backends is checked separately by check_fast_env.py.
+
+import time
+from argparse import ArgumentParser
+from dataclasses import replace
+
+from config import load_config
+from env import GridWorld
+from fast_env import NUMBA_AVAILABLE, FastGridWorld, seed
+from mcts_random import MCTSRandomAgent, simulate
+from mcts_uct import MCTSUctAgent
+
+
+def rollouts_per_second(env, config, num_rollouts: int) -> float:
+    """Time mcts_random.simulate on fresh copies of env."""
+    copies = [env.clone() for _ in range(num_rollouts)]
+    start = time.perf_counter()
+    for i, copy in enumerate(copies):
+        simulate(copy, env.action_space[i % 4], rollout_depth=config.mcts_rollout_depth)
+    return num_rollouts / (time.perf_counter() - start)
+
+
+def seconds_per_decision(env, agent, num_decisions: int) -> float:
+    """Time agent.select_action from the environment's start state."""
+    start = time.perf_counter()
+    for _ in range(num_decisions):
+        agent.select_action(env)
+    return (time.perf_counter() - start) / num_decisions
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Check and benchmark the accelerated GridWorld backend.")
+    parser.add_argument(
+        "--config", type=str, default="configs/larger_grid.yaml", help="Path to the configuration YAML file."
+    )
+    parser.add_argument("--rollouts", type=int, default=20000, help="Number of rollouts to time per backend.")
+    parser.add_argument("--decisions", type=int, default=5, help="Number of MCTS decisions to time per backend.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed, passed to fast_env.seed.")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    print(f"Loaded configuration from {args.config}, Numba {'available' if NUMBA_AVAILABLE else 'not installed'}")
+
+    # Warm up so Numba compilation is not timed
+    FastGridWorld(config=config).clone().rollout("r", rollout_depth=config.mcts_rollout_depth)
+    FastGridWorld(config=config).step("r")
+
+    seed(args.seed)
+    reference_rate = rollouts_per_second(GridWorld(config=config), config, args.rollouts)
+    fast_rate = rollouts_per_second(FastGridWorld(config=config), config, args.rollouts)
+    print(f"\n{'':>20} {'reference':>12} {'fast':>12} {'speedup':>8}")
+    print(f"{'rollouts/s':>20} {reference_rate:>12.0f} {fast_rate:>12.0f} {fast_rate / reference_rate:>7.1f}x")
+
+    for agent_name, agent_class in [("MCTS - Random", MCTSRandomAgent), ("MCTS - UCT", MCTSUctAgent)]:
+        reference_time = seconds_per_decision(GridWorld(config=config), agent_class(config=config), args.decisions)
+        fast_config = replace(config, env_backend="fast")
+        fast_time = seconds_per_decision(
+            FastGridWorld(config=fast_config), agent_class(config=fast_config), args.decisions
+        )
+        label = f"{agent_name} s/move"
+        print(f"{label:>20} {reference_time:>12.3f} {fast_time:>12.3f} {reference_time / fast_time:>7.1f}x")
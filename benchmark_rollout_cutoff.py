@@ -0,0 +1,74 @@
+# Benchmark for rollout cutoff. Runs the MCTS agents with and without value bootstrapping and compares the number of
+# environment steps simulated against the goal-reach rate from run_experiment.
+
+import contextlib
+import io
+import random
+import time
+from argparse import ArgumentParser
+from dataclasses import replace
+
+from config import load_config
+from env import GridWorld
+from mcts_random import MCTSRandomAgent
+from mcts_uct import MCTSUctAgent
+from run_experiment import run_experiment
+
+
+class CountingGridWorld(GridWorld):
+    """GridWorld that counts every step taken, including steps taken by simulation clones."""
+
+    steps = 0
+
+    def step(self, action):
+        CountingGridWorld.steps += 1
+        return super().step(action)
+
+
+def benchmark(config, agent_class, num_trials: int, seed: int):
+    """Run one agent and return (env steps, goal reach rate, average score, seconds)."""
+    random.seed(seed)
+    env = CountingGridWorld(config=config)
+    agent = agent_class(config=config)
+
+    CountingGridWorld.steps = 0
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):  # run_experiment prints every trial
+        scores, num_success, _ = run_experiment(env, agent, num_trials=num_trials)
+    elapsed = time.perf_counter() - start
+
+    return CountingGridWorld.steps, num_success / num_trials, sum(scores) / num_trials, elapsed
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Compare MCTS rollouts with and without cutoff and value bootstrapping.")
+    parser.add_argument(
+        "--config", type=str, default="configs/larger_grid.yaml", help="Path to the configuration YAML file."
+    )
+    parser.add_argument("--trials", type=int, default=None, help="Number of trials per agent (defaults to config).")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed shared by every run.")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    num_trials = args.trials if args.trials is not None else config.num_trials
+    print(f"Loaded configuration from {args.config}, {num_trials} trials per run")
+
+    for agent_name, agent_class in [("MCTS - Random", MCTSRandomAgent), ("MCTS - UCT", MCTSUctAgent)]:
+        print(f"\n============= {agent_name} ==============")
+        print(
+            f"{'estimator':>10} {'env steps':>12} {'saved':>8} {'goal rate':>10} {'change':>8} "
+            f"{'avg score':>10} {'time (s)':>9}"
+        )
+
+        base_steps = base_rate = None
+        for estimator in ["none", "distance", "table"]:
+            steps, rate, avg_score, elapsed = benchmark(
+                replace(config, mcts_value_estimator=estimator), agent_class, num_trials, args.seed
+            )
+            if base_steps is None:
+                base_steps, base_rate = steps, rate
+            saved = 1.0 - steps / base_steps
+            print(
+                f"{estimator:>10} {steps:>12} {saved:>8.1%} {rate:>10.1%} {rate - base_rate:>+8.1%} "
+                f"{avg_score:>10.1f} {elapsed:>9.1f}"
+            )
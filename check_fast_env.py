@@ -0,0 +1,123 @@
+# Equivalence checks for the accelerated environment backend. Seeds both backends with fast_env.seed and checks that
+# FastGridWorld reproduces GridWorld step for step and rollout for rollout. Exits with an error on the first mismatch.
+
+import contextlib
+import io
+import random
+from argparse import ArgumentParser
+from dataclasses import replace
+
+from config import load_config
+from env import GridWorld
+from fast_env import NUMBA_AVAILABLE, FastGridWorld, seed
+from mcts_random import MCTSRandomAgent, simulate
+from run_experiment import run_experiment
+
+
+class EquivalenceError(Exception):
+    """Raised when FastGridWorld and GridWorld disagree."""
+
+
+def check_steps(config, seed_value: int, num_steps: int) -> None:
+    """Step both backends with the same actions and compare every state, reward, and done flag."""
+    actions = random.Random(seed_value).choices(GridWorld(config=config).action_space, k=num_steps)
+
+    seed(seed_value)
+    reference = GridWorld(config=config)
+    expected = [reference.get_state()] + [reference.step(action) for action in actions]
+
+    seed(seed_value)
+    fast = FastGridWorld(config=config)
+    actual = [fast.get_state()] + [fast.step(action) for action in actions]
+
+    for i, (a, b) in enumerate(zip(actual, expected)):
+        if a != b:
+            raise EquivalenceError(f"step {i} differs for seed {seed_value}: fast {a}, reference {b}")
+    if fast.state_history != reference.state_history:
+        raise EquivalenceError(f"state history differs for seed {seed_value}")
+
+
+def check_movement(config, seed_value: int, num_steps: int) -> None:
+    """Call move_agent, move_obstacles, and move_goal directly on both backends and compare the states."""
+    actions = random.Random(seed_value).choices(GridWorld(config=config).action_space, k=num_steps)
+
+    def run(env):
+        states = []
+        for action in actions:
+            env.move_agent(action)
+            env.move_obstacles()
+            env.move_goal()
+            states.append(env.get_state())
+        return states
+
+    seed(seed_value)
+    reference = GridWorld(config=config)
+    reference.obstacles = [list(obs) for obs in reference.obstacles]  # step() does this before moving obstacles
+    expected = run(reference)
+
+    seed(seed_value)
+    actual = run(FastGridWorld(config=config))
+
+    for i, (a, b) in enumerate(zip(actual, expected)):
+        if a != b:
+            raise EquivalenceError(f"movement {i} differs for seed {seed_value}: fast {a}, reference {b}")
+
+
+def check_rollouts(config, seed_value: int, num_rollouts: int) -> None:
+    """Run mcts_random.simulate on both backends from the same start and compare rewards and final states."""
+    for i in range(num_rollouts):
+        first_action = GridWorld(config=config).action_space[i % 4]
+
+        seed(seed_value + i)
+        reference = GridWorld(config=config)
+        expected = simulate(reference, first_action, rollout_depth=config.mcts_rollout_depth)
+
+        seed(seed_value + i)
+        fast = FastGridWorld(config=config)
+        actual = simulate(fast, first_action, rollout_depth=config.mcts_rollout_depth)
+
+        if actual != expected:
+            raise EquivalenceError(
+                f"rollout reward differs for seed {seed_value + i}: fast {actual}, reference {expected}"
+            )
+        if fast.get_state() != reference.get_state():
+            raise EquivalenceError(f"rollout end state differs for seed {seed_value + i}")
+
+
+def check_reproducible(config, seed_value: int, num_trials: int) -> None:
+    """Run the same MCTS experiment twice on the fast backend after seed() and compare the results."""
+    config = replace(config, env_backend="fast", mcts_iterations=20)
+    runs = []
+    for _ in range(2):
+        seed(seed_value)
+        with contextlib.redirect_stdout(io.StringIO()):  # run_experiment prints every trial
+            runs.append(run_experiment(FastGridWorld(config=config), MCTSRandomAgent(config=config), num_trials))
+    if runs[0] != runs[1]:
+        raise EquivalenceError(f"fast backend runs differ for seed {seed_value}")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Check that FastGridWorld matches GridWorld under fixed seeds.")
+    parser.add_argument(
+        "--configs",
+        nargs="+",
+        default=[
+            "configs/default.yaml",
+            "configs/higher_slip.yaml",
+            "configs/goal_moves.yaml",
+            "configs/more_obstacles.yaml",
+        ],
+        help="Configuration YAML files to check.",
+    )
+    parser.add_argument("--seeds", type=int, default=20, help="Number of seeds to check per configuration.")
+    args = parser.parse_args()
+
+    print(f"Numba {'available' if NUMBA_AVAILABLE else 'not installed'}")
+    for config_path in args.configs:
+        config = load_config(config_path)
+        for seed_value in range(args.seeds):
+            check_steps(config, seed_value, num_steps=200)
+            check_movement(config, seed_value, num_steps=200)
+        check_rollouts(config, 0, num_rollouts=10 * args.seeds)
+        check_reproducible(config, 0, num_trials=2)
+        print(f"{config_path}: FastGridWorld matches GridWorld")
@@ -33,6 +33,22 @@ class Config:
     visualize: bool
     output_dir: str
 
+    # Environment backend (optional)
+    env_backend: str = "python"  # "python" (reference GridWorld) or "fast" (compiled with Numba when installed)
+
+    # Rollout cutoff settings (optional)
+    mcts_value_estimator: str = "none"  # "none", "distance", or "table"
+    mcts_cutoff_depth: int = 10  # Rollout steps before a rollout may be cut off and bootstrapped
+    mcts_cutoff_radius: int = 2  # Keep rolling out while an obstacle or the goal is this close to the agent
+    mcts_table_min_visits: int = 5  # Visits before the "table" estimator trusts a cached value
+
+    # Streaming statistics and early stopping settings (optional)
+    confidence_level: float = 0.95  # Confidence level for score and goal-reach intervals
+    checkpoint_every: int = 10  # Write running statistics to output_dir every this many trials (0 disables)
+    early_stop_min_trials: int = 10  # Trials to run before an agent's evaluation may stop early
+    early_stop_ci_width: float = 0.0  # Stop once the score CI half-width is at most this (0 disables)
+    early_stop_compare: bool = False  # Stop once an agent's score CI is disjoint from every agent run before it
+
 
 def load_config(config_path: str) -> Config:
     """Load configuration from a YAML file."""
@@ -79,6 +79,11 @@ class GridWorld:
         self.save_state_to_history()
         return self.get_state(), reward, done
 
+    def advance(self, action):
+        """Take one step and return only (reward, done). Rollouts use this so backends can skip building states."""
+        _, reward, done = self.step(action)
+        return reward, done
+
     def move_agent(self, action):
         if action == "u" and self.agent_pos[1] > 0:
             self.agent_pos[1] -= 1
@@ -126,7 +131,7 @@ class GridWorld:
 
     def clone(self):
         """Create a deep copy of the environment for simulation purposes."""
-        clone_env = GridWorld(config=self.config)
+        clone_env = type(self)(config=self.config)
         clone_env.agent_pos = self.agent_pos.copy()
         clone_env.goal_pos = self.goal_pos.copy()
         clone_env.obstacles = [list(obs) for obs in self.obstacles]
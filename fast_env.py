@@ -0,0 +1,312 @@
+# Accelerated grid world backend. The state is a flat integer array and actions are integers, so single steps and
+# whole random rollouts can run in kernels compiled with Numba. Without Numba the same kernels run as plain Python.
+
+import copy
+import random
+
+import numpy as np
+
+from config import Config
+from env import GridWorld
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # Numba is optional, fall back to the uncompiled kernels
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# Integer action encoding, in the same order as GridWorld.action_space
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+ACTION_INDEX = {"u": UP, "d": DOWN, "l": LEFT, "r": RIGHT}
+
+
+@njit(cache=True)
+def _seed_kernel(seed):
+    """Seed Numba's random generator, which is separate from Python's."""
+    random.seed(seed)
+
+
+@njit(cache=True)
+def _randbelow(n):
+    """Draw an int in [0, n) exactly like Python's random does (k random bits, rejecting values >= n)."""
+    k = 0
+    while (n >> k) > 0:
+        k += 1
+    r = random.getrandbits(k)
+    while r >= n:
+        r = random.getrandbits(k)
+    return r
+
+
+@njit(cache=True)
+def _random_direction():
+    """Draw a direction exactly like random.choice over four actions does."""
+    return _randbelow(4)
+
+
+@njit(cache=True)
+def _neighbor(x, y, direction, size):
+    """Cell next to (x, y) in the given direction, and whether it is inside the grid (False for unknown actions)."""
+    if direction == UP:
+        return x, y - 1, y > 0
+    if direction == DOWN:
+        return x, y + 1, y < size - 1
+    if direction == LEFT:
+        return x - 1, y, x > 0
+    if direction == RIGHT:
+        return x + 1, y, x < size - 1
+    return x, y, False
+
+
+@njit(cache=True)
+def _move_agent_kernel(state, action, size):
+    """Move the agent in place, like GridWorld.move_agent."""
+    x, y, valid = _neighbor(state[0], state[1], action, size)
+    if valid:
+        state[0] = x
+        state[1] = y
+
+
+@njit(cache=True)
+def _move_obstacles_kernel(state, size, obstacle_move_prob):
+    """Move each obstacle in place, like GridWorld.move_obstacles."""
+    for i in range(4, state.shape[0], 2):
+        if random.random() < obstacle_move_prob:
+            x, y, valid = _neighbor(state[i], state[i + 1], _random_direction(), size)
+            if valid and not (x == state[0] and y == state[1]) and not (x == state[2] and y == state[3]):
+                state[i] = x
+                state[i + 1] = y
+
+
+@njit(cache=True)
+def _move_goal_kernel(state, size, goal_move_prob):
+    """Move the goal in place, like GridWorld.move_goal."""
+    if random.random() < goal_move_prob:
+        x, y, valid = _neighbor(state[2], state[3], _random_direction(), size)
+        if valid and not (x == state[0] and y == state[1]):
+            for i in range(4, state.shape[0], 2):
+                if x == state[i] and y == state[i + 1]:
+                    return
+            state[2] = x
+            state[3] = y
+
+
+@njit(cache=True)
+def _step_kernel(
+    state, action, size, slip_prob, obstacle_move_prob, goal_move_prob, movement_reward, obstacle_penalty, goal_reward
+):
+    """Advance the flat state [agent x, agent y, goal x, goal y, obstacle x, obstacle y, ...] by one step in place.
+
+    Random numbers are drawn in the same order as GridWorld.step.
+    """
+    if random.random() < slip_prob:
+        action = _random_direction()
+
+    _move_agent_kernel(state, action, size)
+    _move_obstacles_kernel(state, size, obstacle_move_prob)
+    _move_goal_kernel(state, size, goal_move_prob)
+
+    for i in range(4, state.shape[0], 2):
+        if state[0] == state[i] and state[1] == state[i + 1]:
+            return obstacle_penalty, True
+    if state[0] == state[2] and state[1] == state[3]:
+        return goal_reward, True
+    return movement_reward, False
+
+
+@njit(cache=True)
+def _rollout_kernel(
+    state,
+    first_action,
+    rollout_depth,
+    size,
+    slip_prob,
+    obstacle_move_prob,
+    goal_move_prob,
+    movement_reward,
+    obstacle_penalty,
+    goal_reward,
+):
+    """Take first_action, then random actions until a terminal state or rollout_depth steps. Returns the total reward.
+
+    Mirrors mcts_random.simulate, including the unused action it draws before the first step.
+    """
+    _random_direction()
+    reward, done = _step_kernel(
+        state,
+        first_action,
+        size,
+        slip_prob,
+        obstacle_move_prob,
+        goal_move_prob,
+        movement_reward,
+        obstacle_penalty,
+        goal_reward,
+    )
+    total_reward = float(reward)
+    depth = 1
+
+    while not done and depth < rollout_depth:
+        reward, done = _step_kernel(
+            state,
+            _random_direction(),
+            size,
+            slip_prob,
+            obstacle_move_prob,
+            goal_move_prob,
+            movement_reward,
+            obstacle_penalty,
+            goal_reward,
+        )
+        total_reward += reward
+        depth += 1
+    return total_reward
+
+
+def _init_genrand_state(value: int):
+    """Python random state for a Mersenne Twister seeded with init_genrand, which is how Numba seeds its generator."""
+    mt = [value]
+    for i in range(1, 624):
+        mt.append((1812433253 * (mt[-1] ^ (mt[-1] >> 30)) + i) & 0xFFFFFFFF)
+    return (3, (*mt, 624), None)
+
+
+def seed(value: int) -> None:
+    """Seed Python's random generator and the compiled kernels' generator to the same state.
+
+    FastGridWorld draws all of its randomness from the kernels' generator, so after seed(value) it follows the same
+    trajectory as a GridWorld created after seed(value) and given the same actions. Use this instead of random.seed:
+    with Numba installed, random.seed does not reach the kernels, so fast-backend runs would not be reproducible.
+    Whole experiments are reproducible under seed() but not draw-for-draw identical across backends, since agents
+    keep drawing from Python's generator.
+    """
+    if not 0 <= value < 2**32:
+        raise ValueError(f"Seed must be a 32-bit unsigned integer, got {value}")
+    random.setstate(_init_genrand_state(value))
+    if NUMBA_AVAILABLE:
+        _seed_kernel(value)
+
+
+class FastGridWorld(GridWorld):
+    """GridWorld backed by a flat integer state array and compiled step/rollout kernels.
+
+    Positions are still exposed as lists and states as tuples, so agents and visualization work unchanged. The
+    position properties return copies, so the in-place movement methods of GridWorld are overridden with kernels.
+    """
+
+    record_history = True  # Clones used for simulation skip state_history
+
+    def reset(self):
+        self.state = np.zeros(4 + 2 * self.num_obstacles, dtype=np.int64)
+        return super().reset()
+
+    def generate_obstacles(self):
+        obs = set()
+        while len(obs) < self.num_obstacles:
+            pos = (_randbelow(self.size), _randbelow(self.size))  # Same draws as random.randint(0, size - 1)
+            if pos != tuple(self.agent_pos) and pos != tuple(self.goal_pos) and pos not in obs:
+                obs.add(pos)
+        return obs
+
+    @property
+    def agent_pos(self):
+        return self.state[0:2].tolist()
+
+    @agent_pos.setter
+    def agent_pos(self, pos):
+        self.state[0:2] = pos
+
+    @property
+    def goal_pos(self):
+        return self.state[2:4].tolist()
+
+    @goal_pos.setter
+    def goal_pos(self, pos):
+        self.state[2:4] = pos
+
+    @property
+    def obstacles(self):
+        return self.state[4:].reshape(-1, 2).tolist()
+
+    @obstacles.setter
+    def obstacles(self, obstacles):
+        obstacles = list(obstacles)
+        if len(obstacles) != self.num_obstacles:
+            raise ValueError(f"Expected {self.num_obstacles} obstacles, got {len(obstacles)}")
+        for i, obs in enumerate(obstacles):
+            self.state[4 + 2 * i : 6 + 2 * i] = obs
+
+    def get_state(self):
+        s = self.state.tolist()
+        return ((s[0], s[1]), (s[2], s[3]), tuple(zip(s[4::2], s[5::2])))
+
+    def move_agent(self, action):
+        _move_agent_kernel(self.state, ACTION_INDEX.get(action, -1), self.size)
+
+    def move_obstacles(self):
+        _move_obstacles_kernel(self.state, self.size, self.obstacle_move_prob)
+
+    def move_goal(self):
+        _move_goal_kernel(self.state, self.size, self.goal_move_prob)
+
+    def advance(self, action):
+        """Take one step and return only (reward, done), without building the state tuple."""
+        reward, done = _step_kernel(
+            self.state,
+            ACTION_INDEX.get(action, -1),
+            self.size,
+            self.slip_prob,
+            self.obstacle_move_prob,
+            self.goal_move_prob,
+            self.movement_reward,
+            self.obstacle_penalty,
+            self.goal_reward,
+        )
+        if self.record_history:
+            self.save_state_to_history()
+        return reward, done
+
+    def step(self, action):
+        reward, done = self.advance(action)
+        state = self.state_history[-1] if self.record_history else self.get_state()
+        return state, reward, done
+
+    def rollout(self, first_action, rollout_depth: int = 50) -> float:
+        """Run a whole random rollout in the compiled kernel and return its total reward. History is not recorded."""
+        return _rollout_kernel(
+            self.state,
+            ACTION_INDEX.get(first_action, -1),
+            rollout_depth,
+            self.size,
+            self.slip_prob,
+            self.obstacle_move_prob,
+            self.goal_move_prob,
+            self.movement_reward,
+            self.obstacle_penalty,
+            self.goal_reward,
+        )
+
+    def clone(self):
+        """Create a copy of the environment for simulation purposes."""
+        clone_env = copy.copy(self)  # Skips reset(), which would generate obstacles only to overwrite them
+        clone_env.state = self.state.copy()
+        clone_env.state_history = []  # Don't copy history for simulations
+        clone_env.record_history = False
+        return clone_env
+
+
+def make_env(config: Config) -> GridWorld:
+    """Create the grid world for the backend named in the config."""
+    if config.env_backend == "python":
+        return GridWorld(config=config)
+    if config.env_backend == "fast":
+        return FastGridWorld(config=config)
+    raise ValueError(f"Unknown environment backend: {config.env_backend}")
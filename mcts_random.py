@@ -5,6 +5,7 @@ import random
 
 from agent import AbstractAgent
 from config import Config
+from rollout_cutoff import make_value_estimator, state_key
 
 
 class Node:
@@ -63,23 +64,40 @@ def rollout_policy(env):
     return random.choice(env.action_space)
 
 
-def simulate(env, first_action, rollout_depth: int = 50) -> float:
-    """Roll out with default policy."""
+def simulate(env, first_action, rollout_depth: int = 50, value_estimator=None) -> float:
+    """Roll out with default policy, optionally cutting off early and bootstrapping the rest from a value estimate."""
+    if value_estimator is None and hasattr(env, "rollout"):
+        return env.rollout(first_action, rollout_depth=rollout_depth)  # Whole rollout in the accelerated backend
+
     total_reward = 0.0
     depth = 0
+    cut_off = False
+    trajectory = []  # (state key, reward) pairs for the value estimator
 
     action = rollout_policy(env)
-    _, reward, done = env.step(first_action)
+    reward, done = env.advance(first_action)
     total_reward += reward
     depth += 1
+    if value_estimator is not None:
+        trajectory.append((state_key(env), reward))
 
-    while not is_terminal_env(env) and depth < rollout_depth:
+    while not done and depth < rollout_depth:
+        if value_estimator is not None and value_estimator.should_cutoff(env, depth):
+            cut_off = True
+            break
         action = rollout_policy(env)
-        _, reward, done = env.step(action)
+        reward, done = env.advance(action)
         total_reward += reward
+        if value_estimator is not None:
+            trajectory.append((state_key(env), reward))
         if done:
             break
         depth += 1
+
+    if value_estimator is not None:
+        tail_value = value_estimator.value(env) if cut_off else 0.0  # Only bootstrap rollouts that were cut off
+        value_estimator.update(trajectory, tail_value)
+        total_reward += tail_value
     return total_reward
 
 
@@ -95,6 +113,7 @@ def mcts(
     root_env,
     iterations: int = 500,
     rollout_depth: int = 50,
+    value_estimator=None,
 ):
     """Perform Monte Carlo Tree Search and return the best action."""
     root = Node(root_env.clone())
@@ -106,7 +125,9 @@ def mcts(
         node = random.choice(actions)  # Randomly select one of the expanded nodes
         first_action = node.action
 
-        reward = simulate(root_env.clone(), first_action, rollout_depth=rollout_depth)
+        reward = simulate(
+            root_env.clone(), first_action, rollout_depth=rollout_depth, value_estimator=value_estimator
+        )
         backpropogate(node, reward)
 
     if not root.children:
@@ -126,6 +147,7 @@ class MCTSRandomAgent(AbstractAgent):
         """Initialize the MCTS agent with parameters."""
         self.iterations = config.mcts_iterations
         self.rollout_depth = config.mcts_rollout_depth
+        self.value_estimator = make_value_estimator(config)
 
     def select_action(self, env):
         """Select an action using Monte Carlo Tree Search."""
@@ -133,4 +155,5 @@ class MCTSRandomAgent(AbstractAgent):
             env,
             iterations=self.iterations,
             rollout_depth=self.rollout_depth,
+            value_estimator=self.value_estimator,
         )
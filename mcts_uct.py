@@ -6,6 +6,7 @@ import random
 from agent import AbstractAgent
 from config import Config
 from env import GridWorld
+from rollout_cutoff import make_value_estimator, state_key
 
 
 class Node:
@@ -70,22 +71,42 @@ def rollout_policy(env, node, exploration_param: float = math.sqrt(2)):
     return child_node.action, child_node
 
 
-def simulate(env: GridWorld, node: Node, rollout_depth: int = 50, exploration_param: float = math.sqrt(2)) -> float:
-    """Roll out with default policy."""
+def simulate(
+    env: GridWorld,
+    node: Node,
+    rollout_depth: int = 50,
+    exploration_param: float = math.sqrt(2),
+    value_estimator=None,
+) -> float:
+    """Roll out with default policy, optionally cutting off early and bootstrapping the rest from a value estimate."""
     total_reward = 0.0
     depth = 0
+    cut_off = False
+    trajectory = []  # (state key, reward) pairs for the value estimator
 
-    _, reward, done = env.step(node.action)
+    reward, done = env.advance(node.action)
     total_reward += reward
     depth += 1
+    if value_estimator is not None:
+        trajectory.append((state_key(env), reward))
 
-    while not is_terminal_env(env) and depth < rollout_depth:
+    while not done and depth < rollout_depth:
+        if value_estimator is not None and value_estimator.should_cutoff(env, depth):
+            cut_off = True
+            break
         action, node = rollout_policy(env, node, exploration_param=exploration_param)
-        _, reward, done = env.step(action)
+        reward, done = env.advance(action)
         total_reward += reward
+        if value_estimator is not None:
+            trajectory.append((state_key(env), reward))
         if done:
             break
         depth += 1
+
+    if value_estimator is not None:
+        tail_value = value_estimator.value(env) if cut_off else 0.0  # Only bootstrap rollouts that were cut off
+        value_estimator.update(trajectory, tail_value)
+        total_reward += tail_value
     return total_reward, node
 
 
@@ -102,6 +123,7 @@ def mcts(
     iterations: int = 500,
     exploration_param: float = math.sqrt(2),
     rollout_depth: int = 50,
+    value_estimator=None,
 ):
     """Perform Monte Carlo Tree Search and return the best action."""
     root = Node(root_env.clone())
@@ -113,7 +135,11 @@ def mcts(
         node = random.choice(actions)  # Randomly select one of the expanded nodes
 
         reward, final_node = simulate(
-            root_env.clone(), node, rollout_depth=rollout_depth, exploration_param=exploration_param
+            root_env.clone(),
+            node,
+            rollout_depth=rollout_depth,
+            exploration_param=exploration_param,
+            value_estimator=value_estimator,
         )
         backpropogate(final_node, reward)
 
@@ -135,6 +161,7 @@ class MCTSUctAgent(AbstractAgent):
         self.iterations = config.mcts_iterations
         self.exploration_param = config.mcts_ucb_c
         self.rollout_depth = config.mcts_rollout_depth
+        self.value_estimator = make_value_estimator(config)
 
     def select_action(self, env):
         """Select an action using Monte Carlo Tree Search."""
@@ -143,4 +170,5 @@ class MCTSUctAgent(AbstractAgent):
             iterations=self.iterations,
             exploration_param=self.exploration_param,
             rollout_depth=self.rollout_depth,
+            value_estimator=self.value_estimator,
         )
@@ -0,0 +1,93 @@
+# Rollout cutoff and value bootstrapping for the MCTS agents. Rollouts are truncated once nothing terminal is nearby
+# and the rest of the return is estimated from a cheap value function instead of simulated step by step.
+
+from config import Config
+
+
+def state_key(env):
+    """Key used to cache values: the agent and goal positions (obstacles are ignored to keep the table small)."""
+    return (tuple(env.agent_pos), tuple(env.goal_pos))
+
+
+class DistanceValueEstimator:
+    """Estimate the remaining return from the Manhattan distance between the agent and the goal."""
+
+    def __init__(self, config: Config):
+        """Initialize the estimator with the environment rewards and cutoff parameters."""
+        self.movement_reward = config.movement_reward
+        self.obstacle_penalty = config.obstacle_penalty
+        self.goal_reward = config.goal_reward
+        self.slip_prob = config.slip_prob
+        self.cutoff_depth = config.mcts_cutoff_depth
+        self.cutoff_radius = config.mcts_cutoff_radius
+        # Rough per-step chance of running into an obstacle: the fraction of the grid they occupy
+        self.collision_prob = min(config.num_obstacles / config.grid_size**2, 1.0)
+
+    def should_cutoff(self, env, depth: int) -> bool:
+        """Stop the rollout once past the cutoff depth, unless an obstacle or the goal is within the cutoff radius."""
+        if depth < self.cutoff_depth:
+            return False
+
+        x, y = env.agent_pos
+        gx, gy = env.goal_pos
+        if abs(x - gx) + abs(y - gy) <= self.cutoff_radius:
+            return False
+        for obs in env.obstacles:
+            if abs(x - obs[0]) + abs(y - obs[1]) <= self.cutoff_radius:
+                return False
+        return True
+
+    def distance_value(self, env) -> float:
+        """Expected return of walking straight to the goal, accounting for slips and possible collisions."""
+        x, y = env.agent_pos
+        gx, gy = env.goal_pos
+        steps = (abs(x - gx) + abs(y - gy)) / max(1.0 - self.slip_prob, 1e-6)
+        survival = (1.0 - self.collision_prob) ** steps
+        return survival * (self.goal_reward + steps * self.movement_reward) + (1.0 - survival) * self.obstacle_penalty
+
+    def value(self, env) -> float:
+        """Estimate the return still to come from the current state."""
+        return self.distance_value(env)
+
+    def update(self, trajectory, tail_value: float) -> None:
+        """Learn from a finished rollout. The distance estimator is fixed, so this does nothing."""
+
+
+class TableValueEstimator(DistanceValueEstimator):
+    """Estimate the remaining return from a table of observed returns, cached per state.
+
+    States that have not been visited often enough fall back to the distance estimate.
+    """
+
+    def __init__(self, config: Config):
+        """Initialize an empty value table."""
+        super().__init__(config)
+        self.min_visits = config.mcts_table_min_visits
+        self.table = {}  # state key -> [total return, count]
+
+    def value(self, env) -> float:
+        """Average observed return from this state, or the distance estimate if it has too few visits."""
+        entry = self.table.get(state_key(env))
+        if entry is None or entry[1] < self.min_visits:
+            return self.distance_value(env)
+        return entry[0] / entry[1]
+
+    def update(self, trajectory, tail_value: float) -> None:
+        """Add the return-to-go of every state visited in the rollout to the table."""
+        return_to_go = tail_value
+        for key, reward in reversed(trajectory):
+            entry = self.table.setdefault(key, [0.0, 0])
+            entry[0] += return_to_go
+            entry[1] += 1
+            return_to_go += reward
+
+
+def make_value_estimator(config: Config):
+    """Create the value estimator named in the config, or None if rollouts should not be cut off."""
+    if config.mcts_value_estimator == "none":
+        return None
+    if config.mcts_value_estimator == "distance":
+        return DistanceValueEstimator(config)
+    if config.mcts_value_estimator == "table":
+        return TableValueEstimator(config)
+    raise ValueError(f"Unknown value estimator: {config.mcts_value_estimator}")
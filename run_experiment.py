@@ -1,22 +1,32 @@
 # Uses all code to run the experiment.
 
 from argparse import ArgumentParser
+from pathlib import Path
 
 import matplotlib.pyplot as plt
 
 from agent import AbstractAgent
 from baselines import GreedyAgent, RandomAgent
-from config import load_config
+from config import Config, load_config
 from env import GridWorld
+from fast_env import make_env
 from mcts_random import MCTSRandomAgent
 from mcts_uct import MCTSUctAgent
+from streaming_stats import EarlyStopping, StreamingStats
 from visualize import visualize_environment
 
 
-def run_experiment(world: GridWorld, agent: AbstractAgent, num_trials: int):
-    scores = []
-    num_time_goal_reached = 0
-    best_score = float("-inf")
+def run_experiment(
+    world: GridWorld,
+    agent: AbstractAgent,
+    num_trials: int,
+    stats: StreamingStats | None = None,
+    early_stopping: EarlyStopping | None = None,
+):
+    """Run up to num_trials trials, updating `stats` after each one and stopping early if `early_stopping` says so."""
+    if stats is None:
+        stats = StreamingStats(name=type(agent).__name__)
+    scores = []  # Kept only for the box plot, all other results come from stats
     for trial in range(num_trials):
         world.reset()
         done = False
@@ -29,21 +39,57 @@ def run_experiment(world: GridWorld, agent: AbstractAgent, num_trials: int):
             total_reward += reward
 
         scores.append(total_reward)
-        if total_reward > best_score:
-            best_score = total_reward
+        if total_reward > stats.best_score:
             best_run = world.state_history.copy()
         agent_pos, goal_pos, _ = world.get_state()
         reached_goal = agent_pos == goal_pos
-        if reached_goal:
-            num_time_goal_reached += 1
-
-        print(f"Trial {trial + 1}/{num_trials}, Total Reward: {total_reward}, Goal Reached: {reached_goal}")
+        stats.update(total_reward, reached_goal)
+
+        low, high = stats.score_ci()
+        print(
+            f"Trial {trial + 1}/{num_trials}, Total Reward: {total_reward}, Goal Reached: {reached_goal}, "
+            f"Running Mean: {stats.mean:.2f} (CI {low:.2f} to {high:.2f})"
+        )
+
+        if early_stopping is not None:
+            stats.stop_reason = early_stopping.should_stop(stats)
+            if stats.stop_reason is not None:
+                print(f"Stopping early after {stats.count} trials: {stats.stop_reason}")
+                break
+
+    if stats.checkpoint_path is not None:
+        stats.save_checkpoint()
+
+    low, high = stats.score_ci()
+    success_low, success_high = stats.success_ci()
+    confidence = f"{stats.confidence:.0%} CI"
+    print(f"\nAverage Score over {stats.count} trials: {stats.mean:.2f} ({confidence} {low:.2f} to {high:.2f})")
+    print(f"Number of times goal reached: {stats.successes} out of {stats.count}")
+    print(f"Goal reach rate: {stats.success_rate:.1%} ({confidence} {success_low:.1%} to {success_high:.1%})")
+
+    return scores, stats.successes, best_run
+
+
+def make_stats(config: Config, name: str) -> StreamingStats:
+    """Create running statistics for an agent, checkpointed to the config's output directory."""
+    file_name = name.lower().replace(" - ", "_").replace(" ", "_") + "_stats.json"
+    return StreamingStats(
+        name=name,
+        confidence=config.confidence_level,
+        checkpoint_path=Path(config.output_dir) / file_name,
+        checkpoint_every=config.checkpoint_every,
+    )
 
-    avg_score = sum(scores) / num_trials
-    print(f"\nAverage Score over {num_trials} trials: {avg_score}")
-    print(f"Number of times goal reached: {num_time_goal_reached} out of {num_trials}")
 
-    return scores, num_time_goal_reached, best_run
+def make_early_stopping(config: Config, previous_stats: list[StreamingStats]) -> EarlyStopping:
+    """Create the early stopping rule from the config, comparing against agents that were already evaluated."""
+    return EarlyStopping(
+        max_trials=config.num_trials,
+        min_trials=config.early_stop_min_trials,
+        ci_width=config.early_stop_ci_width,
+        compare_to=previous_stats if config.early_stop_compare else None,
+        confidence=config.confidence_level,
+    )
 
 
 if __name__ == "__main__":
@@ -57,14 +103,23 @@ if __name__ == "__main__":
         config = load_config(args.config)
         print(f"Loaded configuration from {args.config}")
 
-    env = GridWorld(config=config)
+    env = make_env(config)
     NUM_TRIALS = config.num_trials
     size = config.grid_size
+    all_stats = []
 
     print("\n============== Random Agent ==============")
 
     random_agent = RandomAgent()
-    random_scores, random_success, best_random_run = run_experiment(env, random_agent, num_trials=NUM_TRIALS)
+    random_stats = make_stats(config, "Random Agent")
+    random_scores, random_success, best_random_run = run_experiment(
+        env,
+        random_agent,
+        num_trials=NUM_TRIALS,
+        stats=random_stats,
+        early_stopping=make_early_stopping(config, all_stats),
+    )
+    all_stats.append(random_stats)
 
     random_state_vec = best_random_run
     visualize_environment(size, random_state_vec, figure_title="Random Agent")
@@ -72,7 +127,15 @@ if __name__ == "__main__":
     print("\n============= Greedy Agent ==============")
 
     greedy_agent = GreedyAgent()
-    greedy_scores, greedy_success, best_greedy_run = run_experiment(env, greedy_agent, num_trials=NUM_TRIALS)
+    greedy_stats = make_stats(config, "Greedy Agent")
+    greedy_scores, greedy_success, best_greedy_run = run_experiment(
+        env,
+        greedy_agent,
+        num_trials=NUM_TRIALS,
+        stats=greedy_stats,
+        early_stopping=make_early_stopping(config, all_stats),
+    )
+    all_stats.append(greedy_stats)
 
     greedy_state_vec = best_greedy_run
     visualize_environment(size, greedy_state_vec, figure_title="Greedy Agent")
@@ -80,9 +143,15 @@ if __name__ == "__main__":
     print("\n============= MCTS Agent - Random ==============")
 
     mcts_random_agent = MCTSRandomAgent(config=config)
+    mcts_random_stats = make_stats(config, "MCTS - Random")
     mcts_random_scores, mcts_random_success, best_mcts_run = run_experiment(
-        env, mcts_random_agent, num_trials=NUM_TRIALS
+        env,
+        mcts_random_agent,
+        num_trials=NUM_TRIALS,
+        stats=mcts_random_stats,
+        early_stopping=make_early_stopping(config, all_stats),
     )
+    all_stats.append(mcts_random_stats)
 
     mcts_state_vec = best_mcts_run
     visualize_environment(size, mcts_state_vec, figure_title="MCTS Agent - Random")
@@ -90,7 +159,15 @@ if __name__ == "__main__":
     print("\n============= MCTS Agent - UCT ==============")
 
     mcts_uct_agent = MCTSUctAgent(config=config)
-    mcts_uct_scores, mcts_uct_success, best_mcts_uct_run = run_experiment(env, mcts_uct_agent, num_trials=NUM_TRIALS)
+    mcts_uct_stats = make_stats(config, "MCTS - UCT")
+    mcts_uct_scores, mcts_uct_success, best_mcts_uct_run = run_experiment(
+        env,
+        mcts_uct_agent,
+        num_trials=NUM_TRIALS,
+        stats=mcts_uct_stats,
+        early_stopping=make_early_stopping(config, all_stats),
+    )
+    all_stats.append(mcts_uct_stats)
 
     mcts_uct_state_vec = best_mcts_uct_run
     visualize_environment(size, mcts_uct_state_vec, figure_title="MCTS Agent - UCT")
@@ -106,13 +183,20 @@ if __name__ == "__main__":
     plt.grid()
     plt.show()
 
-    # Bar plot for number of times goal reached
+    # Bar plot for goal reach rate (agents may run different numbers of trials when stopping early)
+    success_rates = [stats.success_rate for stats in all_stats]
+    success_cis = [stats.success_ci() for stats in all_stats]
     plt.figure(figsize=(8, 8))
     plt.bar(
-        ["Random Agent", "Greedy Agent", "MCTS - Random", "MCTS - UCT"],
-        [random_success, greedy_success, mcts_random_success, mcts_uct_success],
+        [stats.name for stats in all_stats],
+        success_rates,
+        yerr=[
+            [rate - low for rate, (low, _) in zip(success_rates, success_cis)],
+            [high - rate for rate, (_, high) in zip(success_rates, success_cis)],
+        ],
+        capsize=8,
     )
-    plt.title('Number of Times Goal Reached\n(Press "q" to exit)')
-    plt.ylabel("Count")
+    plt.title(f'Goal Reach Rate ({config.confidence_level:.0%} CI)\n(Press "q" to exit)')
+    plt.ylabel("Fraction of Trials")
     plt.grid(axis="y")
     plt.show()
@@ -0,0 +1,132 @@
+# Running statistics for experiments. Scores are aggregated one trial at a time so results can be reported,
+# checkpointed, and used to stop an agent's evaluation early without waiting for every trial to finish.
+
+import json
+import math
+from pathlib import Path
+from statistics import NormalDist
+
+
+class StreamingStats:
+    """Running mean/variance of trial scores and goal-reach rate, with confidence intervals."""
+
+    def __init__(self, name: str, confidence: float = 0.95, checkpoint_path=None, checkpoint_every: int = 10):
+        """Initialize empty statistics. A checkpoint is written every `checkpoint_every` trials if a path is given."""
+        self.name = name
+        self.confidence = confidence
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path is not None else None
+        self.checkpoint_every = checkpoint_every
+        self.count = 0
+        self.successes = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # Sum of squared differences from the mean (Welford's algorithm)
+        self.best_score = float("-inf")
+        self.stop_reason = None
+
+    def update(self, score: float, reached_goal: bool) -> None:
+        """Add the result of one trial."""
+        self.count += 1
+        delta = score - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (score - self.mean)
+        self.successes += int(reached_goal)
+        self.best_score = max(self.best_score, score)
+
+        if self.checkpoint_path is not None and self.checkpoint_every > 0 and self.count % self.checkpoint_every == 0:
+            self.save_checkpoint()
+
+    @property
+    def variance(self) -> float:
+        """Sample variance of the scores."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def success_rate(self) -> float:
+        """Fraction of trials that reached the goal."""
+        return self.successes / self.count if self.count > 0 else 0.0
+
+    def score_ci(self, z: float | None = None) -> tuple[float, float]:
+        """Normal confidence interval for the mean score, at the stats' confidence level unless `z` is given."""
+        if self.count < 2:
+            return (-float("inf"), float("inf"))
+        half_width = (self.z if z is None else z) * math.sqrt(self.variance / self.count)
+        return (self.mean - half_width, self.mean + half_width)
+
+    def success_ci(self) -> tuple[float, float]:
+        """Wilson score confidence interval for the goal-reach rate."""
+        if self.count == 0:
+            return (0.0, 1.0)
+        n, p, z = self.count, self.success_rate, self.z
+        center = (p + z**2 / (2 * n)) / (1 + z**2 / n)
+        half_width = z * math.sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / (1 + z**2 / n)
+        return (max(center - half_width, 0.0), min(center + half_width, 1.0))
+
+    def to_dict(self) -> dict:
+        """Summary of the statistics, used for checkpoints."""
+        return {
+            "name": self.name,
+            "trials": self.count,
+            "mean_score": self.mean,
+            "score_variance": self.variance,
+            "score_ci": list(self.score_ci()),
+            "best_score": self.best_score,
+            "successes": self.successes,
+            "success_rate": self.success_rate,
+            "success_ci": list(self.success_ci()),
+            "confidence": self.confidence,
+            "stop_reason": self.stop_reason,
+        }
+
+    def save_checkpoint(self) -> None:
+        """Write the current statistics to the checkpoint file as JSON."""
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.checkpoint_path.open("w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+class EarlyStopping:
+    """Sequential stopping rule for an agent's evaluation.
+
+    The score CI is checked after every trial from `min_trials` to `max_trials`, so each look uses a
+    Bonferroni-adjusted z (alpha = 1 - confidence split evenly over the looks). The adjusted intervals then cover
+    the true mean score at every look at once with probability at least `confidence`, which bounds the chance of
+    wrongly separating two agents by alpha. This relies on the normal approximation, which is rough at the small
+    trial counts where an early stop can happen.
+    """
+
+    def __init__(
+        self, max_trials: int, min_trials: int = 10, ci_width: float = 0.0, compare_to=None, confidence: float = 0.95
+    ):
+        """Stop once the score CI half-width is at most `ci_width`, or once the score CI is disjoint from every
+        agent in `compare_to`. Neither rule applies before `min_trials` trials, and a value of 0 or an empty list
+        disables the corresponding rule.
+
+        Separation is required from every earlier agent, not just one, so that an early stop still leaves the
+        agent's place in the comparison plots settled. Stopping after separating from only one agent would leave
+        its comparison with the others unresolved.
+        """
+        self.min_trials = max(min_trials, 2)
+        self.ci_width = ci_width
+        self.compare_to = compare_to or []
+        num_looks = max(max_trials - self.min_trials + 1, 1)
+        self.z = NormalDist().inv_cdf(1 - (1 - confidence) / (2 * num_looks))
+
+    def should_stop(self, stats: StreamingStats):
+        """Return the reason to stop, or None to keep running trials."""
+        if stats.count < self.min_trials:
+            return None
+
+        low, high = stats.score_ci(z=self.z)
+        if self.ci_width > 0 and (high - low) / 2 <= self.ci_width:
+            return f"adjusted score CI half-width {(high - low) / 2:.2f} <= {self.ci_width}"
+
+        if self.compare_to:
+            for other in self.compare_to:
+                other_low, other_high = other.score_ci(z=self.z)
+                if low <= other_high and other_low <= high:
+                    return None
+            names = ", ".join(other.name for other in self.compare_to)
+            return f"adjusted score CI separated from {names}"
+
+        return None